@@ -1,17 +1,22 @@
+import io
+import os
 import sys
+import importlib.util
 import json
+import multiprocessing
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from functools import partial
+from html import escape
 import warnings
 warnings.filterwarnings('ignore')
 
-# 필수 라이브러리
-import camelot
-import pdfplumber
-import pandas as pd
-from tabulate import tabulate
+# 필수 라이브러리(camelot, pdfplumber, pandas, openpyxl, tabulate)는
+# 시작 시간과 워커 프로세스 메모리를 줄이기 위해 사용하는 함수 안에서 임포트
 
 # tqdm 임포트 (진행 표시)
 try:
@@ -21,6 +26,37 @@ except ImportError:
     TQDM_AVAILABLE = False
     tqdm = lambda x, **kwargs: x  # 더미 함수
 
+# PyMuPDF 설치 여부 (빠른 텍스트 추출, 없으면 pdfplumber로 텍스트 추출)
+PYMUPDF_AVAILABLE = importlib.util.find_spec('fitz') is not None
+
+# orjson 임포트 (빠른 JSON 저장, 없으면 표준 json 사용)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 텍스트 블록 판별용 정규식 (모듈 로드 시 한 번만 컴파일)
+_HEADING_NUM = re.compile(r'^\d+[\.\)]\s+')
+_KEYWORD_RE = re.compile('장|절|부|팀|담당')
+# 리스트 패턴을 하나의 정규식으로 합치고, 매칭된 그룹 이름으로 depth 결정
+_LIST_RE = re.compile(
+    r'^(?P<d1a>[○●▪▫•·]\s+)'     # 불릿 포인트
+    r'|^(?P<d1b>[-*+]\s+)'        # 대시, 별표
+    r'|^(?P<d1c>\d+[\.\)]\s+)'    # 숫자 리스트
+    r'|^(?P<d2a>[가-하][\.\)]\s+)'  # 한글 리스트
+    r'|^(?P<d2b>[a-z][\.\)]\s+)'    # 영문 소문자 리스트
+)
+_LIST_DEPTHS = {'d1a': 1, 'd1b': 1, 'd1c': 1, 'd2a': 2, 'd2b': 2}
+
+# pdfplumber로 한 번에 열어 둘 최대 페이지 수 (페이지 캐시로 인한 메모리 증가 제한)
+_PAGE_CHUNK_SIZE = 50
+
+# 페이지 처리 워커 프로세스 시작 방식 (fork 대신 forkserver, 지원하지 않는 OS에서는 spawn)
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
 
 @dataclass
 class TextBlock:
@@ -31,6 +67,7 @@ class TextBlock:
     page_num: int = 1
     bbox: Optional[Tuple[float, float, float, float]] = None  # x0, y0, x1, y1
     metadata: Dict = None
+    table_index: Optional[int] = None  # block_type이 'table'인 경우 페이지 내 테이블 번호
 
 
 @dataclass
@@ -61,11 +98,28 @@ class PDFExtractor:
         print(f"\n📄 PDF 파일 분석: {self.pdf_path}")
         print(f"📏 파일 크기: {self.pdf_path.stat().st_size / 1024:.1f} KB")
         
-        # pdfplumber로 추출
-        self._extract_with_pdfplumber()
-
-        # Camelot으로 테이블 보완
-        self._extract_tables_with_camelot()
+        # pdfplumber 추출과 Camelot stream/lattice 보완을 동시에 실행
+        # (PyMuPDF가 있으면 텍스트는 PyMuPDF, pdfplumber는 테이블만 담당)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(self._extract_with_pdfplumber): 'pdfplumber',
+                executor.submit(self._camelot_stream): 'camelot_stream',
+                executor.submit(self._camelot_lattice): 'camelot_lattice',
+            }
+            if PYMUPDF_AVAILABLE:
+                futures[executor.submit(self._extract_text_with_pymupdf)] = 'pymupdf'
+            results = {futures[future]: future.result() for future in as_completed(futures)}
+        
+        # 완료 순서와 무관하게 소스 순서대로 한 번에 병합
+        text_blocks, tables = results['pdfplumber']
+        if PYMUPDF_AVAILABLE:
+            # 안정 정렬이므로 같은 페이지에서는 텍스트 뒤에 테이블 마커가 위치
+            text_blocks = sorted(results['pymupdf'] + text_blocks, key=lambda b: b.page_num)
+        self.text_blocks.extend(text_blocks)
+        self.tables.extend(tables)
+        self.tables.extend(results['camelot_stream'])
+        self.tables.extend(results['camelot_lattice'])
+        
         self._cross_validate_tables()
         
         # 결과 저장
@@ -75,82 +129,93 @@ class PDFExtractor:
         print(f"📊 텍스트 블록: {len(self.text_blocks)}개")
         print(f"📊 테이블: {len(self.tables)}개")
         
-    def _extract_with_pdfplumber(self):
-        """pdfplumber로 텍스트와 테이블 추출"""
+    def _extract_with_pdfplumber(self) -> Tuple[List[TextBlock], List[TableData]]:
+        """pdfplumber로 텍스트와 테이블 추출 (페이지 단위 병렬 처리)"""
+        import pdfplumber
+        
         print("\n🔄 pdfplumber로 추출 중...")
         
         with pdfplumber.open(str(self.pdf_path)) as pdf:
-            pages = tqdm(pdf.pages, desc="페이지 처리") if TQDM_AVAILABLE else pdf.pages
+            n_pages = len(pdf.pages)
+        
+        text_blocks: List[TextBlock] = []
+        tables: List[TableData] = []
+        
+        # 페이지 파싱은 CPU 바운드이므로 페이지 묶음 단위로 프로세스 풀에 분산
+        # (묶음 크기는 워커 수에 맞추되 _PAGE_CHUNK_SIZE를 넘지 않음)
+        workers = os.cpu_count() or 1
+        chunk_size = max(1, min(_PAGE_CHUNK_SIZE, -(-n_pages // workers)))
+        page_chunks = [
+            list(range(start, min(start + chunk_size, n_pages + 1)))
+            for start in range(1, n_pages + 1, chunk_size)
+        ]
+        
+        worker = partial(_process_pages, str(self.pdf_path))
+        # 이 함수는 Camelot/PyMuPDF 스레드가 실행 중인 스레드 풀 안에서 호출되므로,
+        # 멀티스레드 프로세스를 fork하지 않도록(교착 위험) forkserver/spawn으로 워커 생성
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as executor:
+            results = executor.map(worker, page_chunks)
+            results = tqdm(results, total=len(page_chunks), desc="페이지 처리") if TQDM_AVAILABLE else results
             
-            for page_num, page in enumerate(pages, 1):
-                # 텍스트 추출 (레이아웃 보존)
-                self._extract_text_with_layout(page, page_num)
-                
-                # 테이블 추출
-                tables = page.extract_tables()
-                for table_idx, table in enumerate(tables):
-                    if table and len(table) > 1:  # 유효한 테이블만
-                        table_data = TableData(
-                            data=table,
-                            page_num=page_num,
-                            source='pdfplumber',
-                            confidence=self._calculate_table_confidence(table)
-                        )
-                        self.tables.append(table_data)
-                        
-                        # 테이블 위치에 마커 추가
-                        self.text_blocks.append(TextBlock(
-                            text=f"[TABLE_{page_num}_{table_idx + 1}]",
-                            block_type='table',
-                            page_num=page_num
-                        ))
+            # map은 입력 순서를 보존하므로 페이지 순서대로 병합됨
+            for page_blocks, page_tables in results:
+                text_blocks.extend(page_blocks)
+                tables.extend(page_tables)
+        
+        return text_blocks, tables
+    
+    def _extract_text_with_pymupdf(self) -> List[TextBlock]:
+        """PyMuPDF로 텍스트 추출 (블록 단위)"""
+        import fitz
+        
+        print("\n🔄 PyMuPDF로 텍스트 추출 중...")
+        
+        text_blocks: List[TextBlock] = []
+        with fitz.open(str(self.pdf_path)) as doc:
+            for page_num, page in enumerate(doc, 1):
+                # (x0, y0, x1, y1, text, block_no, block_type) - block_type 0: 텍스트, 1: 이미지
+                for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks"):
+                    if block_type != 0:
+                        continue
+                    # 블록 내 줄바꿈은 단락 내 줄로 보고 공백으로 연결
+                    paragraph_text = ' '.join(line.strip() for line in text.splitlines() if line.strip())
+                    PDFExtractor._add_text_block(text_blocks, paragraph_text, page_num)
+        
+        return text_blocks
     
-    def _extract_text_with_layout(self, page, page_num: int):
+    @staticmethod
+    def _extract_text_with_layout(page, page_num: int, blocks: List[TextBlock]):
         """레이아웃을 보존하며 텍스트 추출"""
-        # 텍스트를 문자 단위로 추출하여 스타일 정보 분석
-        chars = page.chars if hasattr(page, 'chars') else []
-        
-        # 폰트 크기별로 그룹화 (heading 감지용)
-        font_sizes = {}
-        for char in chars:
-            size = round(char.get('height', 0))
-            if size not in font_sizes:
-                font_sizes[size] = []
-            font_sizes[size].append(char)
-        
-        # 평균 폰트 크기 계산
-        if font_sizes:
-            sizes = list(font_sizes.keys())
-            avg_size = sum(sizes) / len(sizes) if sizes else 12
-        else:
-            avg_size = 12
-        
         # 텍스트 라인별로 추출
         text = page.extract_text()
         if not text:
             return
         
-        lines = text.split('\n')
-        current_paragraph = []
+        # 단락 버퍼 (중간 리스트 없이 줄을 바로 이어 붙임)
+        buf = io.StringIO()
+        has_text = False
         
-        for line in lines:
+        for line in text.splitlines():
             line = line.strip()
             if not line:
                 # 빈 줄 = 단락 구분
-                if current_paragraph:
-                    paragraph_text = ' '.join(current_paragraph)
-                    self._add_text_block(paragraph_text, page_num, avg_size)
-                    current_paragraph = []
+                if has_text:
+                    PDFExtractor._add_text_block(blocks, buf.getvalue(), page_num)
+                    buf = io.StringIO()
+                    has_text = False
                 continue
             
-            current_paragraph.append(line)
+            if has_text:
+                buf.write(' ')
+            buf.write(line)
+            has_text = True
         
         # 마지막 단락 처리
-        if current_paragraph:
-            paragraph_text = ' '.join(current_paragraph)
-            self._add_text_block(paragraph_text, page_num, avg_size)
+        if has_text:
+            PDFExtractor._add_text_block(blocks, buf.getvalue(), page_num)
     
-    def _add_text_block(self, text: str, page_num: int, avg_font_size: float):
+    @staticmethod
+    def _add_text_block(blocks: List[TextBlock], text: str, page_num: int):
         """텍스트 블록 추가 (타입 자동 판별)"""
         if not text:
             return
@@ -159,43 +224,34 @@ class PDFExtractor:
         is_heading = False
         heading_level = 0
         
-        # 제목 패턴들
-        if len(text) < 100:  # 짧은 텍스트
+        # 제목 패턴들 (긴 단락은 대소문자/키워드 검사 자체를 건너뜀)
+        text_len = len(text)
+        if text_len < 100:  # 짧은 텍스트
             # 숫자로 시작하는 섹션
-            if re.match(r'^\d+[\.\)]\s+', text):
+            if _HEADING_NUM.match(text):
                 is_heading = True
                 heading_level = 2
             # 대문자로 시작하고 짧은 경우
-            elif text.isupper() or (text[0].isupper() and len(text) < 50):
+            elif (text_len < 50 and text[0].isupper()) or text.isupper():
                 is_heading = True
                 heading_level = 1
             # 특수 키워드
-            elif any(keyword in text.lower() for keyword in ['장', '절', '부', '팀', '담당']):
+            elif _KEYWORD_RE.search(text):
                 is_heading = True
                 heading_level = 2
         
         # List item 판별
         is_list = False
         list_depth = 0
-
-        list_patterns = [
-            (r'^[○●▪▫•·]\s+', 1),  # 불릿 포인트
-            (r'^[-*+]\s+', 1),       # 대시, 별표
-            (r'^\d+[\.\)]\s+', 1),   # 숫자 리스트
-            (r'^[가-하][\.\)]\s+', 2),  # 한글 리스트
-            (r'^[a-z][\.\)]\s+', 2),   # 영문 소문자 리스트
-        ]
         
-        for pattern, depth in list_patterns:
-            if re.match(pattern, text):
-                is_list = True
-                list_depth = depth
-                break
+        list_match = _LIST_RE.match(text)
+        if list_match:
+            is_list = True
+            list_depth = _LIST_DEPTHS[list_match.lastgroup]
         
-        # 들여쓰기 감지 (추가 depth)
-        leading_spaces = len(text) - len(text.lstrip())
-        if leading_spaces > 4:
-            list_depth += 1
+            # 들여쓰기 감지 (추가 depth, 앞 5글자만 확인하여 lstrip 복사 회피)
+            if text_len > 4 and text[:5].isspace():
+                list_depth += 1
         
         # 블록 타입 결정
         if is_heading:
@@ -209,70 +265,83 @@ class PDFExtractor:
             level = 0
         
         # 텍스트 블록 추가
-        self.text_blocks.append(TextBlock(
+        blocks.append(TextBlock(
             text=text,
             block_type=block_type,
             level=level,
             page_num=page_num
         ))
     
-    def _extract_tables_with_camelot(self):
-        """Camelot으로 테이블 추출"""
-
-        print("\n🔄 Camelot으로 테이블 보완 중...")
+    def _camelot_stream(self) -> List[TableData]:
+        """Camelot stream 모드로 테이블 추출 (테이블 경계가 명확하지 않은 경우)"""
+        import camelot
+        
+        print("\n🔄 Camelot(stream)으로 테이블 보완 중...")
         
         try:
-            # 모든 페이지에서 테이블 추출 시도
-            # stream 모드: 테이블 경계가 명확하지 않은 경우
             tables_stream = camelot.read_pdf(
                 str(self.pdf_path),
                 pages='all',
                 flavor='stream',
                 suppress_stdout=True
             )
-            
-            for table in tables_stream:
-                if len(table.df) > 1:  # 유효한 테이블만
-                    table_data = TableData(
-                        data=table.df.values.tolist(),
-                        page_num=table.page,
-                        source='camelot_stream',
-                        confidence=table.accuracy
-                    )
-                    self.tables.append(table_data)
-            
-            # lattice 모드: 테이블 경계가 명확한 경우
-            try:
-                tables_lattice = camelot.read_pdf(
-                    str(self.pdf_path),
-                    pages='all',
-                    flavor='lattice',
-                    suppress_stdout=True
-                )
-                
-                for table in tables_lattice:
-                    if len(table.df) > 1:
-                        table_data = TableData(
-                            data=table.df.values.tolist(),
-                            page_num=table.page,
-                            source='camelot_lattice',
-                            confidence=table.accuracy
-                        )
-                        self.tables.append(table_data)
-            except:
-                pass  # lattice 모드 실패 시 무시
-                
         except Exception as e:
             self.comparison_report.append(f"Camelot 오류: {str(e)}")
+            return []
+        
+        return [
+            TableData(
+                data=table.df.values.tolist(),
+                page_num=table.page,
+                source='camelot_stream',
+                confidence=table.accuracy
+            )
+            for table in tables_stream
+            if len(table.df) > 1  # 유효한 테이블만
+        ]
+    
+    def _camelot_lattice(self) -> List[TableData]:
+        """Camelot lattice 모드로 테이블 추출 (테이블 경계가 명확한 경우)"""
+        import camelot
+        
+        print("\n🔄 Camelot(lattice)으로 테이블 보완 중...")
+        
+        try:
+            tables_lattice = camelot.read_pdf(
+                str(self.pdf_path),
+                pages='all',
+                flavor='lattice',
+                suppress_stdout=True
+            )
+        except:
+            return []  # lattice 모드 실패 시 무시
+        
+        return [
+            TableData(
+                data=table.df.values.tolist(),
+                page_num=table.page,
+                source='camelot_lattice',
+                confidence=table.accuracy
+            )
+            for table in tables_lattice
+            if len(table.df) > 1
+        ]
     
-    def _calculate_table_confidence(self, table: List[List]) -> float:
+    @staticmethod
+    def _calculate_table_confidence(table: List[List]) -> float:
         """테이블 신뢰도 계산"""
         if not table:
             return 0.0
         
-        # 기준: 셀이 비어있지 않은 비율, 열 일관성 등
-        total_cells = sum(len(row) for row in table)
-        non_empty_cells = sum(1 for row in table for cell in row if cell and str(cell).strip())
+        # 기준: 셀이 비어있지 않은 비율, 열 일관성 등 (한 번의 순회로 집계)
+        total_cells = 0
+        non_empty_cells = 0
+        col_counts = []
+        for row in table:
+            total_cells += len(row)
+            # strip()으로 새 문자열을 만들지 않고 공백 여부만 확인
+            non_empty_cells += sum(1 for cell in row if cell and not str(cell).isspace())
+            col_counts.append(len(row))
         
         if total_cells == 0:
             return 0.0
@@ -280,13 +349,9 @@ class PDFExtractor:
         # 비어있지 않은 셀 비율
         fill_rate = non_empty_cells / total_cells
         
-        # 열 수 일관성
-        col_counts = [len(row) for row in table]
-        if col_counts:
-            most_common_cols = max(set(col_counts), key=col_counts.count)
-            consistency_rate = col_counts.count(most_common_cols) / len(col_counts)
-        else:
-            consistency_rate = 0
+        # 열 수 일관성 (가장 흔한 열 수의 비율)
+        _, consistency_hits = Counter(col_counts).most_common(1)[0]
+        consistency_rate = consistency_hits / len(col_counts)
         
         # 종합 신뢰도
         confidence = (fill_rate * 0.6 + consistency_rate * 0.4) * 100
@@ -297,62 +362,42 @@ class PDFExtractor:
 
         print("\n🔄 테이블 교차 검증 중...")
         
-        # 페이지별로 테이블 그룹화
-        tables_by_page = {}
+        # 한 번의 순회로 페이지별 최고 신뢰도 테이블만 유지
+        best_per_page: Dict[int, TableData] = {}
+        candidates_per_page: Dict[int, int] = {}
         for table in self.tables:
-            if table.page_num not in tables_by_page:
-                tables_by_page[table.page_num] = []
-            tables_by_page[table.page_num].append(table)
-        
-        # 각 페이지에서 최적 테이블 선택
-        validated_tables = []
-        
-        for page_num, page_tables in tables_by_page.items():
-            if len(page_tables) == 1:
-                validated_tables.append(page_tables[0])
-            else:
-                # 여러 소스가 있는 경우 비교
-                sources = {}
-                for table in page_tables:
-                    if table.source not in sources:
-                        sources[table.source] = []
-                    sources[table.source].append(table)
-                
-                # 소스별 최고 신뢰도 테이블 선택
-                best_tables = []
-                for source, tables in sources.items():
-                    best = max(tables, key=lambda t: t.confidence)
-                    best_tables.append(best)
-                
-                # 전체에서 최고 신뢰도 선택
-                if best_tables:
-                    best_table = max(best_tables, key=lambda t: t.confidence)
-                    validated_tables.append(best_table)
-                    
-                    # 비교 리포트 추가
-                    self.comparison_report.append(
-                        f"Page {page_num}: 선택된 소스 = {best_table.source} "
-                        f"(신뢰도: {best_table.confidence:.1f}%)"
-                    )
+            candidates_per_page[table.page_num] = candidates_per_page.get(table.page_num, 0) + 1
+            current = best_per_page.get(table.page_num)
+            if current is None or table.confidence > current.confidence:
+                best_per_page[table.page_num] = table
+        
+        # 여러 후보가 있었던 페이지만 비교 리포트 추가
+        for page_num, best_table in best_per_page.items():
+            if candidates_per_page[page_num] > 1:
+                self.comparison_report.append(
+                    f"Page {page_num}: 선택된 소스 = {best_table.source} "
+                    f"(신뢰도: {best_table.confidence:.1f}%)"
+                )
         
         # 검증된 테이블로 교체
-        self.tables = validated_tables
+        self.tables = list(best_per_page.values())
     
     def _save_results(self):
         """결과 저장"""
         print("\n💾 결과 저장 중...")
         
-        # 1. Markdown 저장
-        self._save_markdown()
-        
-        # 2. HTML 저장
-        self._save_html()
-        
-        # 3. JSON 저장
-        self._save_json()
-        
-        # 4. 테이블 CSV/Excel 저장
-        self._save_tables()
+        # 1~4. Markdown / HTML / JSON / 테이블 CSV·Excel 저장
+        # 각 저장 함수는 추출 결과를 읽기만 하므로 동시에 실행
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self._save_markdown),
+                executor.submit(self._save_html),
+                executor.submit(self._save_json),
+                executor.submit(self._save_tables),
+            ]
+            wait(futures)
+        for future in futures:
+            future.result()  # 저장 중 발생한 예외 전달
         
         # 5. 비교 리포트 저장
         if self.comparison_report:
@@ -362,54 +407,66 @@ class PDFExtractor:
     
     def _save_markdown(self):
         """Markdown 형식으로 저장"""
-        md_lines = []
-        current_page = 0
+        from tabulate import tabulate
         
-        for block in self.text_blocks:
-            # 페이지 구분
-            if block.page_num != current_page:
-                current_page = block.page_num
-                md_lines.append(f"\n---\n\n# 📄 Page {current_page}\n")
+        # 페이지별 테이블 인덱스 (블록마다 전체 테이블을 훑지 않도록)
+        tables_by_page = defaultdict(list)
+        for table in self.tables:
+            tables_by_page[table.page_num].append(table)
+        
+        md_path = self.output_dir / "extracted_text.md"
+        
+        # 문자열을 모아 join하지 않고 버퍼링된 파일에 바로 기록
+        with md_path.open('w', encoding='utf-8', buffering=1 << 20) as f:
+            current_page = 0
             
-            # 블록 타입별 포맷팅
-            if block.block_type == 'heading':
-                prefix = '#' * (block.level + 1)
-                md_lines.append(f"\n{prefix} {block.text}\n")
-            elif block.block_type == 'list_item':
-                indent = '  ' * (block.level - 1)
-                md_lines.append(f"{indent}- {block.text}")
-            elif block.block_type == 'table':
-                # 테이블 마커 찾기
-                table_match = re.match(r'\[TABLE_(\d+)_(\d+)\]', block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
+            for block in self.text_blocks:
+                # 페이지 구분
+                if block.page_num != current_page:
+                    current_page = block.page_num
+                    print(f"\n---\n\n# 📄 Page {current_page}\n", file=f)
+            
+                # 블록 타입별 포맷팅
+                if block.block_type == 'heading':
+                    prefix = '#' * (block.level + 1)
+                    print(f"\n{prefix} {block.text}\n", file=f)
+                elif block.block_type == 'list_item':
+                    indent = '  ' * (block.level - 1)
+                    print(f"{indent}- {block.text}", file=f)
+                elif block.block_type == 'table':
+                    # 테이블 위치 정보
+                    page_num = block.page_num
+                    table_idx = block.table_index
                     
                     # 해당 테이블 찾기
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            md_lines.append(f"\n### 📊 Table {table_idx}\n")
-                            if table.data:
-                                # 테이블을 Markdown 형식으로 변환
-                                md_table = tabulate(
-                                    table.data[1:] if len(table.data) > 1 else table.data,
-                                    headers=table.data[0] if table.data else [],
-                                    tablefmt='pipe'
-                                )
-                                md_lines.append(md_table)
-                                md_lines.append(f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n")
-                            break
-            else:  # paragraph
-                md_lines.append(f"\n{block.text}\n")
+                    for table in tables_by_page.get(page_num, ()):
+                        print(f"\n### 📊 Table {table_idx}\n", file=f)
+                        if table.data:
+                            # 테이블을 Markdown 형식으로 변환
+                            md_table = tabulate(
+                                table.data[1:] if len(table.data) > 1 else table.data,
+                                headers=table.data[0] if table.data else [],
+                                tablefmt='pipe'
+                            )
+                            print(md_table, file=f)
+                            print(f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n", file=f)
+                        break
+                else:  # paragraph
+                    print(f"\n{block.text}\n", file=f)
         
-        # 파일 저장
-        md_path = self.output_dir / "extracted_text.md"
-        md_path.write_text('\n'.join(md_lines), encoding='utf-8')
         print(f"  ✅ Markdown: {md_path}")
     
     def _save_html(self):
         """HTML 형식으로 저장"""
-        html_lines = ["""
+        # 페이지별 테이블 인덱스
+        tables_by_page = defaultdict(list)
+        for table in self.tables:
+            tables_by_page[table.page_num].append(table)
+        
+        html_path = self.output_dir / "extracted_text.html"
+        
+        with html_path.open('w', encoding='utf-8', buffering=1 << 20) as f:
+            print("""
 <!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -433,66 +490,58 @@ class PDFExtractor:
 </head>
 <body>
     <h1>📄 PDF 추출 결과</h1>
-        """]
-        
-        current_page = 0
-        
-        for block in self.text_blocks:
-            # 페이지 구분
-            if block.page_num != current_page:
-                if current_page > 0:
-                    html_lines.append('</div>')
-                current_page = block.page_num
-                html_lines.append(f'<div class="page-break"><h2>Page {current_page}</h2>')
+            """, file=f)
+            
+            current_page = 0
             
-            # 블록 타입별 HTML
-            if block.block_type == 'heading':
-                tag = f'h{min(block.level + 2, 6)}'
-                html_lines.append(f'<{tag}>{block.text}</{tag}>')
-            elif block.block_type == 'list_item':
-                class_name = f'list-item-{block.level}' if block.level > 1 else 'list-item'
-                html_lines.append(f'<div class="{class_name}">• {block.text}</div>')
-            elif block.block_type == 'table':
-                # 테이블 HTML
-                table_match = re.match(r'\[TABLE_(\d+)_(\d+)\]', block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
+            for block in self.text_blocks:
+                # 페이지 구분
+                if block.page_num != current_page:
+                    if current_page > 0:
+                        print('</div>', file=f)
+                    current_page = block.page_num
+                    print(f'<div class="page-break"><h2>Page {current_page}</h2>', file=f)
+            
+                # 블록 타입별 HTML
+                if block.block_type == 'heading':
+                    tag = f'h{min(block.level + 2, 6)}'
+                    print(f'<{tag}>{escape(block.text)}</{tag}>', file=f)
+                elif block.block_type == 'list_item':
+                    class_name = f'list-item-{block.level}' if block.level > 1 else 'list-item'
+                    print(f'<div class="{class_name}">• {escape(block.text)}</div>', file=f)
+                elif block.block_type == 'table':
+                    # 테이블 HTML
+                    page_num = block.page_num
+                    table_idx = block.table_index
                     
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            html_lines.append(f'<h3>Table {table_idx}</h3>')
-                            if table.data:
-                                html_lines.append('<table>')
-                                # 헤더
-                                if len(table.data) > 0:
-                                    html_lines.append('<thead><tr>')
-                                    for cell in table.data[0]:
-                                        html_lines.append(f'<th>{cell if cell else ""}</th>')
-                                    html_lines.append('</tr></thead>')
-                                # 본문
-                                if len(table.data) > 1:
-                                    html_lines.append('<tbody>')
-                                    for row in table.data[1:]:
-                                        html_lines.append('<tr>')
-                                        for cell in row:
-                                            html_lines.append(f'<td>{cell if cell else ""}</td>')
-                                        html_lines.append('</tr>')
-                                    html_lines.append('</tbody>')
-                                html_lines.append('</table>')
-                                html_lines.append(f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>')
-                            break
-            else:  # paragraph
-                html_lines.append(f'<p class="paragraph">{block.text}</p>')
-        
-        if current_page > 0:
-            html_lines.append('</div>')
-        
-        html_lines.append('</body></html>')
+                    for table in tables_by_page.get(page_num, ()):
+                        print(f'<h3>Table {table_idx}</h3>', file=f)
+                        if table.data:
+                            print('<table>', file=f)
+                            # 헤더
+                            if len(table.data) > 0:
+                                f.write('<thead><tr>' + ''.join(
+                                    f'<th>{escape(str(cell)) if cell else ""}</th>' for cell in table.data[0]
+                                ) + '</tr></thead>\n')
+                            # 본문 (행 단위로 한 번에 기록)
+                            if len(table.data) > 1:
+                                print('<tbody>', file=f)
+                                for row in table.data[1:]:
+                                    f.write('<tr>' + ''.join(
+                                        f'<td>{escape(str(cell)) if cell else ""}</td>' for cell in row
+                                    ) + '</tr>\n')
+                                print('</tbody>', file=f)
+                            print('</table>', file=f)
+                            print(f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>', file=f)
+                        break
+                else:  # paragraph
+                    print(f'<p class="paragraph">{escape(block.text)}</p>', file=f)
+            
+            if current_page > 0:
+                print('</div>', file=f)
+            
+            print('</body></html>', file=f)
         
-        # 파일 저장
-        html_path = self.output_dir / "extracted_text.html"
-        html_path.write_text('\n'.join(html_lines), encoding='utf-8')
         print(f"  ✅ HTML: {html_path}")
     
     def _save_json(self):
@@ -535,8 +584,14 @@ class PDFExtractor:
         
         # 파일 저장
         json_path = self.output_dir / "extracted_data.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            json_path.write_bytes(orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"  ✅ JSON: {json_path}")
     
     def _save_tables(self):
@@ -544,28 +599,83 @@ class PDFExtractor:
         if not self.tables:
             return
         
+        import openpyxl
+        import pandas as pd
+        
         tables_dir = self.output_dir / "tables"
         tables_dir.mkdir(exist_ok=True)
         
-        # 개별 CSV 저장
-        for idx, table in enumerate(self.tables, 1):
-            if table.data:
-                df = pd.DataFrame(table.data[1:], columns=table.data[0] if table.data else None)
-                csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
-                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        # DataFrame은 테이블당 한 번만 생성 (번호는 전체 테이블 기준 유지)
+        frames = [
+            (idx, table, pd.DataFrame(table.data[1:], columns=table.data[0]))
+            for idx, table in enumerate(self.tables, 1)
+            if table.data
+        ]
+        if not frames:
+            return
+        
+        # 개별 CSV 저장 (파일 단위로 병렬 기록)
+        def write_csv(frame):
+            idx, table, df = frame
+            csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
+            with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+                df.to_csv(f, index=False, lineterminator='\n')
         
-        # 통합 Excel 저장
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(write_csv, frames))
+        
+        # 통합 Excel 저장 (write-only 모드로 원본 행을 그대로 스트리밍)
         excel_path = tables_dir / "all_tables.xlsx"
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            for idx, table in enumerate(self.tables, 1):
-                if table.data:
-                    df = pd.DataFrame(table.data[1:], columns=table.data[0] if table.data else None)
-                    sheet_name = f'Page{table.page_num}_T{idx}'[:31]  # Excel 시트명 제한
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+        wb = openpyxl.Workbook(write_only=True)
+        for idx, table, _ in frames:
+            sheet_name = f'Page{table.page_num}_T{idx}'[:31]  # Excel 시트명 제한
+            ws = wb.create_sheet(title=sheet_name)
+            for row in table.data:
+                ws.append(row)
+        wb.save(excel_path)
         
         print(f"  ✅ Tables: {tables_dir}/")
 
 
+def _process_pages(pdf_path: str, page_numbers: List[int]) -> Tuple[List[TextBlock], List[TableData]]:
+    """페이지 묶음의 텍스트 블록과 테이블 추출 (프로세스 풀 작업 단위)"""
+    import pdfplumber
+    
+    text_blocks: List[TextBlock] = []
+    tables: List[TableData] = []
+    
+    # 필요한 페이지만 열고, 처리가 끝난 페이지의 캐시는 바로 비움
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            page_num = page.page_number
+            
+            # 텍스트 추출 (레이아웃 보존, PyMuPDF가 없을 때만)
+            if not PYMUPDF_AVAILABLE:
+                PDFExtractor._extract_text_with_layout(page, page_num, text_blocks)
+            
+            # 테이블 추출
+            for table_idx, table in enumerate(page.extract_tables()):
+                if table and len(table) > 1:  # 유효한 테이블만
+                    tables.append(TableData(
+                        data=table,
+                        page_num=page_num,
+                        source='pdfplumber',
+                        confidence=PDFExtractor._calculate_table_confidence(table)
+                    ))
+                    
+                    # 테이블 위치에 마커 추가
+                    text_blocks.append(TextBlock(
+                        text="",
+                        block_type='table',
+                        page_num=page_num,
+                        table_index=table_idx + 1
+                    ))
+            
+            page.flush_cache()
+    
+    return text_blocks, tables
+
+
 def main():
     """메인 함수"""
     if len(sys.argv) < 2:
@@ -0,0 +1,32 @@
+from utils import xhtml_to_markdown
+
+# hwp5html로 미리 변환해 둔 업무분장 HTML로 hwp_to_markdown의 표 변환 결과를 확인
+SAMPLE_HTML_PATH = "./PDFs/연소기술부_업무분장(2025.2.17.) (4).html"
+
+
+def check_rowspan_alignment(html_path: str) -> None:
+    """병합된 행(rowspan)이 있는 표에서 열 위치가 밀리지 않는지 확인합니다."""
+    with open(html_path, "rt", encoding="utf-8") as f:
+        markdown = xhtml_to_markdown(f.read())
+
+    tables = [block for block in markdown.split("\n\n") if block.startswith("|")]
+    assert tables, "Markdown 표가 없습니다."
+
+    # 모든 행의 칸 수가 헤더와 같아야 함
+    for table in tables:
+        widths = {line.count(" | ") for line in table.split("\n") if not line.startswith("| ---")}
+        assert len(widths) == 1, f"행마다 칸 수가 다릅니다:\n{table}"
+
+    # 구분(rowspan)이 아래 행에도 채워져 직위/성명/업무/대행 열이 제자리에 있어야 함
+    row = next(line for line in markdown.split("\n") if "고재민 (4)" in line and "혼탄관리" in line)
+    cells = [cell.strip() for cell in row.strip("|").split(" | ")]
+    assert cells[0] == "연료 운영  1과", cells
+    assert cells[1] == "직원", cells
+    assert cells[2].startswith("고재민"), cells
+    assert cells[3].startswith("• 1 ~4 호기 혼탄관리"), cells
+    assert cells[4] == "김유리", cells
+
+    print("ok :", html_path)
+
+
+check_rowspan_alignment(SAMPLE_HTML_PATH)
@@ -18,9 +18,9 @@ if image_file is not None:
     ai_content = make_response(
         user_content=user_content,
         image_file=image_file,
-
+        stream=True,
     )
-    st.write(ai_content)
+    st.write_stream(ai_content) #응답이 오는 대로 바로 화면에 출력
 
                  
 #실행하려면 터미널에 streamlit run streamlit_05.py 입력
\ No newline at end of file
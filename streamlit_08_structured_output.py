@@ -1,3 +1,5 @@
+import hashlib
+import json
 from dotenv import load_dotenv
 import streamlit as st
 from pydantic import BaseModel
@@ -10,19 +12,42 @@ class Person(BaseModel):
 class PersonList(BaseModel):
     persons: list[Person]
 
-load_dotenv()
+# 스키마(모델 정의)가 바뀌면 캐시도 새로 만들어지도록 스키마 해시를 캐시 키에 포함
+SCHEMA_KEY = hashlib.blake2b(
+    json.dumps(PersonList.model_json_schema(), sort_keys=True).encode(), digest_size=16
+).hexdigest()
 
-input_textarea = st.text_area("추출한 텍스트를 입력해주세요.") #글 입력하는 창 만드는거
+# Streamlit은 위젯 조작마다 스크립트 전체를 다시 실행하므로, 같은 입력에 대해서는
+# API를 다시 호출하지 않고 캐시된 결과를 사용
+@st.cache_data(ttl=3600, show_spinner=False)
+def extract_persons(user_content: str, model: str, temperature: float, schema_key: str) -> dict | None:
+    """내용에서 담당, 업무를 추출합니다 (입력, 모델, 온도, 스키마 기준 캐시).
 
-if input_textarea:
-    user_content = "내용에서 각각의 담당, 업무를 JSON포맷으로 추출해주세요.\n\n----\n\n" + input_textarea
+    모델이 응답을 거부한 경우 None을 반환합니다.
+    """
     ai_response = make_response(
         user_content=user_content,
+        model=model,
+        temperature=temperature,
         response_format=PersonList
-        
     )
-    obj: PersonList = ai_response.parsed
-    for person in obj.persons:
-        person.담당
-        person.업무 #list[str]        
-    st.text(f"AI : {ai_response}")
\ No newline at end of file
+    if ai_response.parsed is None:
+        return None
+    # 캐시에는 pickle 가능한 dict로 저장
+    return ai_response.parsed.model_dump()
+
+load_dotenv()
+
+input_textarea = st.text_area("추출한 텍스트를 입력해주세요.") #글 입력하는 창 만드는거
+
+if input_textarea.strip():
+    user_content = "내용에서 각각의 담당, 업무를 JSON포맷으로 추출해주세요.\n\n----\n\n" + input_textarea
+    obj_dict = extract_persons(user_content, "gpt-4o-mini", 0.25, SCHEMA_KEY)
+    if obj_dict is None:
+        st.warning("모델이 응답을 거부했습니다. 입력 내용을 확인해주세요.")
+    else:
+        obj = PersonList.model_validate(obj_dict)
+        for person in obj.persons:
+            person.담당
+            person.업무 #list[str]        
+        st.text(f"AI : {obj}")
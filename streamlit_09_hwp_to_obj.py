@@ -1,19 +1,166 @@
+import hashlib
+import io
+import json
 from dotenv import load_dotenv
 import streamlit as st
-from utils import hwp_to_html
-from pydantic import BaseModel
-from utils import make_response
+from utils import hwp_to_markdown
+from pydantic import BaseModel, Field
+from utils import make_responses_batch
 
+# 출력 JSON의 키 이름도 모델이 한 토큰씩 생성하므로 짧은 영문 키를 사용하고,
+# 의미는 description(입력 토큰)으로, 화면 표시는 serialization_alias로 전달
 class Person(BaseModel):
-    직위: str
-    성명: str
-    담당업무: list[str]
-    대행자 : str | None = None
-    전화번호: str | None = None
+    p: str = Field(serialization_alias="직위", description="직위 (부장, 차장, 직원 등)")
+    n: str = Field(serialization_alias="성명", description="성명 (이름만)")
+    t: list[str] = Field(serialization_alias="담당업무", description="담당 업무 목록")
+    tel: str = Field(serialization_alias="전화번호", description="전화번호 (없으면 빈 문자열)")
+    d: str = Field(serialization_alias="대행자", description="대행자 (없으면 빈 문자열)")
 
 class OrganizationInfo(BaseModel):
     persons: list[Person]
 
+# 스키마(모델 정의)가 바뀌면 캐시도 새로 만들어지도록 스키마 해시를 캐시 키에 포함
+SCHEMA_KEY = hashlib.blake2b(
+    json.dumps(OrganizationInfo.model_json_schema(), sort_keys=True).encode(), digest_size=16
+).hexdigest()
+
+# 고정된 지시문을 앞(system)에, 매번 바뀌는 표 내용을 맨 뒤(user)에 두어
+# OpenAI의 프롬프트 캐싱(동일한 앞부분 재사용)이 적용되도록 함
+SYSTEM_PROMPT = """
+다음 Markdown 표에서 업무분장 정보를 추출해주세요.
+
+표의 행과 열 구조를 분석하여 다음 정보를 추출해주세요:
+1. 문서 제목과 날짜
+2. 부서별 구성원 정보:
+   - 직위 (부장, 차장, 직원 등)
+   - 성명 (이름만)
+   - 전화번호 (있는 경우)
+   - 담당 업무 목록 (•로 구분된 각 업무를 리스트로)
+   - 대행자 (있는 경우)
+
+부서가 여러 개인 경우 각 부서별로 구분하여 추출해주세요.
+병합된 칸의 값은 아래 행마다 반복 표기되어 있으므로, 같은 사람이 여러 행에 나오면 한 명으로 합쳐 업무를 모아주세요.
+'문서 정보', '표 앞 내용', '참고 - 문서 첫 표의 머리글'은 표를 해석하기 위한 참고 정보이며, 표에 없는 사람은 추출하지 마세요.
+"""
+
+# 응답 최대 토큰 수 추정용 (테이블 한 행 = 구성원 한 명 기준)
+# 한 행에 여러 명이 함께 적힌 경우도 있으므로, 응답이 입력 표 내용을 옮겨 적는 수준이라고 보고
+# 입력 글자 수(한글 한 글자 ≈ 1토큰 이하)도 함께 고려하여 더 큰 값을 사용
+BASE_MAX_TOKENS = 200
+TOKENS_PER_ROW = 400
+# 모델(gpt-4o-mini)이 한 번에 생성할 수 있는 최대 토큰 수 (이보다 크면 API가 400 오류 반환)
+MAX_COMPLETION_TOKENS = 16_384
+
+
+def estimate_max_tokens(user_content: str) -> int:
+    """요청 내용(표 행 수, 글자 수)으로 응답 최대 토큰 수를 추정합니다 (모델 출력 한도 이내)."""
+    rows = sum(line.startswith("|") for line in _table_lines(user_content))
+    return min(BASE_MAX_TOKENS + max(TOKENS_PER_ROW * rows, len(user_content)), MAX_COMPLETION_TOKENS)
+
+
+# 문서가 이 길이(문자 수) 이하이면 표별로 나누지 않고 한 번에 요청
+SINGLE_REQUEST_MAX_CHARS = 3000
+
+
+def _table_lines(table_md: str) -> list[str]:
+    """Markdown 표에서 구분선(| --- |)을 뺀 행 목록을 반환합니다."""
+    return [line for line in table_md.split("\n") if not line.startswith("| ---")]
+
+
+def _is_roster_table(table_md: str) -> bool:
+    """구성원 표인지 판별합니다 (열이 3개 이상이고 머리글 아래 데이터 행이 있는 표).
+
+    한 칸짜리 제목 상자나 머리글만 있는 결재란은 구성원 표가 아닙니다.
+    """
+    lines = _table_lines(table_md)
+    return lines[0].count(" | ") >= 2 and len(lines) > 1
+
+
+def split_requests(markdown: str) -> list[str]:
+    """Markdown 문서를 구성원 표 단위의 요청(user 메시지)으로 나눕니다.
+
+    각 요청에는 문서 앞부분(제목, 날짜 등)과 표 바로 앞의 문단(과/담당차장 등)을 함께 붙이고,
+    머리글이 다른 표(다음 페이지로 이어진 표 등)에는 첫 구성원 표의 머리글을 참고로 붙입니다.
+    구성원 표가 아닌 표는 따로 요청하지 않으며, 작은 문서는 나누지 않고 한 번에 요청합니다.
+    """
+    if len(markdown) <= SINGLE_REQUEST_MAX_CHARS:
+        return ["Markdown 문서 내용:\n" + markdown]
+
+    preamble: list[str] = []  # 첫 구성원 표 앞의 내용 (문서 제목, 날짜 등)
+    context: list[str] = []  # 직전 표 이후의 문단
+    header = None  # 첫 구성원 표의 머리글 행
+    user_contents = []
+    # hwp_to_markdown은 표와 문단을 빈 줄로 구분하므로, "|"로 시작하는 블록이 표
+    for block in markdown.split("\n\n"):
+        if not block.startswith("|"):
+            context.append(block)
+            continue
+        if not _is_roster_table(block):
+            # 한 칸짜리 표(제목 상자 등)는 문단처럼 취급하고, 결재란 등 나머지는 제외
+            if " | " not in block.split("\n", 1)[0]:
+                context.append(" ".join(line.strip("| ") for line in _table_lines(block)))
+            continue
+
+        if header is None:
+            header = block.split("\n", 1)[0]
+            # 첫 표 바로 앞 문단은 그 표의 소제목(과/담당차장 등)이므로 해당 표에만 붙이고,
+            # 나머지(문서 제목, 날짜 등)는 이후 모든 표에 문서 정보로 붙임
+            preamble, context = (context[:-1], context[-1:]) if len(context) > 1 else (context, [])
+
+        parts = []
+        if preamble:
+            parts.append("문서 정보:\n" + "\n".join(preamble))
+        if context:
+            parts.append("표 앞 내용:\n" + "\n".join(context))
+        if not block.startswith(header):
+            parts.append("참고 - 문서 첫 표의 머리글:\n" + header)
+        parts.append("Markdown 표 내용:\n" + block)
+        user_contents.append("\n\n".join(parts))
+        context = []
+
+    return user_contents or ["Markdown 문서 내용:\n" + markdown]  # 구성원 표가 없으면 문서 전체를 한 번에 처리
+
+
+# Streamlit은 위젯 조작마다 스크립트 전체를 다시 실행하므로, 파일 내용의 해시를 키로
+# 변환/추출 결과를 캐시하여 같은 파일에 대해 HWP 변환과 API 호출을 반복하지 않음
+# (밑줄로 시작하는 인자는 캐시 키 계산에서 제외됨)
+@st.cache_data(show_spinner=False)
+def convert_hwp(digest: str, _data: bytes) -> str:
+    """HWP 파일 내용을 Markdown으로 변환합니다 (digest 기준 캐시)."""
+    return hwp_to_markdown(hwp_file=io.BytesIO(_data))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def extract_persons(
+    digest: str, system_prompt: str, model: str, schema_key: str, _markdown: str
+) -> tuple[list[dict], int]:
+    """변환된 Markdown에서 부서별 구성원 정보를 추출합니다 (digest, 프롬프트, 모델, 스키마 기준 캐시).
+
+    Returns:
+        (구성원 dict 리스트, 모델이 응답을 거부한 요청 수)
+    """
+    # 부서(테이블)별로 나누어 동시에 요청 -> 전체 시간은 가장 느린 요청 수준
+    user_contents = split_requests(_markdown)
+    responses = make_responses_batch(
+        user_contents,
+        system_content=system_prompt,
+        response_format=OrganizationInfo,
+        model=model,
+        temperature=0.1,
+        max_tokens=[estimate_max_tokens(content) for content in user_contents],  # 요청마다 따로 추정
+    )
+
+    # 캐시에는 pickle 가능한 dict로 저장 (응답을 거부한 요청은 parsed가 None)
+    persons = [
+        person.model_dump()
+        for response in responses
+        if response.parsed is not None
+        for person in response.parsed.persons
+    ]
+    refused = sum(response.parsed is None for response in responses)
+    return persons, refused
+
+
 load_dotenv()
 
 hwp_file = st.file_uploader(
@@ -22,36 +169,15 @@ hwp_file = st.file_uploader(
     accept_multiple_files=False,
 )
 if hwp_file is not None:
-    html = hwp_to_html(hwp_file=hwp_file) #키워드 인자
-    # st.markdown(html, unsafe_allow_html=True)
-
-    prompt = f"""
-            다음 HTML 문서에서 업무분장 정보를 추출해주세요.
-            
-            HTML 내용:
-    {html}
-            
-            위 HTML에서 테이블 구조를 분석하여 다음 정보를 추출해주세요:
-            1. 문서 제목과 날짜
-            2. 부서별 구성원 정보:
-               - 직위 (부장, 차장, 직원 등)
-               - 성명 (이름만)
-               - 전화번호 (있는 경우)
-               - 담당 업무 목록 (•로 구분된 각 업무를 리스트로)
-               - 대행자 (있는 경우)
-            
-            부서가 여러 개인 경우 각 부서별로 구분하여 추출해주세요.
-            """
-    response = make_response(
-        user_content=prompt,
-        response_format=OrganizationInfo,
-        model="gpt-4o-mini",
-        temperature=0.1,
-        
-    )
+    data = hwp_file.getvalue()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
 
-    # st.text(f"AI : {response.parsed}")
+    markdown = convert_hwp(digest, data)
+    # st.markdown(markdown)
 
-    obj: OrganizationInfo = response.parsed
-    for person in obj.persons:
-        st.text({"직위": person.직위, "성명": person.성명, "담당업무": person.담당업무,"전화번호": person.전화번호, "대행자": person.대행자})
\ No newline at end of file
+    person_dicts, refused = extract_persons(digest, SYSTEM_PROMPT, "gpt-4o-mini", SCHEMA_KEY, markdown)
+    if refused:
+        st.warning(f"{refused}개 표에 대해 모델이 응답을 거부하여 해당 구성원 정보가 빠졌습니다.")
+    persons = [Person.model_validate(person) for person in person_dicts]
+    for person in persons:
+        st.text(person.model_dump(by_alias=True)) #{"직위": ..., "성명": ..., "담당업무": ..., "전화번호": ..., "대행자": ...}
\ No newline at end of file
@@ -8,7 +8,10 @@ PROMPT_TEMPLATE_01 = """
 with open("./prompts/업무분장.txt","rt", encoding="utf-8") as f:
     PROMPT_TEMPLATE = f.read()
 
+# 자리표시자가 {html} 하나뿐이므로 미리 앞/뒤로 나눠 두고 이어 붙이기만 함 (format 파싱 생략)
+PROMPT_PREFIX, PROMPT_SUFFIX = PROMPT_TEMPLATE.split("{html}", 1)
+
 html = hwp_to_html(hwp_file=hwp_file) #키워드 인자
-user_content = PROMPT_TEMPLATE.format(html=html)
+user_content = PROMPT_PREFIX + html + PROMPT_SUFFIX
 make_response(user_content=user_content)
 
@@ -1,18 +1,26 @@
 import os
-import mimetypes
-import requests
+import asyncio
+import functools
+import shutil
 import tempfile
-from base64 import b64encode
+import weakref
+from pathlib import Path
 from dataclasses import dataclass
-from typing import BinaryIO, Protocol, TypeVar, Generic, overload
+from typing import BinaryIO, Iterable, Iterator, Literal, Protocol, TypeVar, Generic, overload
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import AsyncOpenAI, ContentFilterFinishReasonError, LengthFinishReasonError, OpenAI
+from openai.lib._pydantic import to_strict_json_schema
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai.types.shared.chat_model import ChatModel
-from bs4 import BeautifulSoup
-from hwp5.xmlmodel import Hwp5File
-from hwp5.hwp5html import HTMLTransform
 from contextlib import closing
 
+# pybase64 임포트 (SIMD 가속 base64 인코딩, 없으면 표준 base64 사용)
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
 
 class FileUploadProtocol(Protocol):
     """파일 업로드 객체의 프로토콜 정의.
@@ -24,7 +32,7 @@ class FileUploadProtocol(Protocol):
     def name(self) -> str: ...  # 파일명
     @property
     def type(self) -> str: ...  # MIME 타입
-    def read(self) -> bytes: ...  # 파일 내용 읽기
+    def read(self, size: int = -1) -> bytes: ...  # 파일 내용 읽기
 
 
 @dataclass
@@ -42,36 +50,106 @@ class Usage:
     total_tokens: int
 
 
-class ResponseWithUsage(str):
-    """문자열처럼 동작하면서 usage 정보를 포함하는 응답 클래스.
+@dataclass(slots=True)
+class ResponseWithUsage:
+    """응답 문자열과 usage 정보를 포함하는 응답 클래스.
+
+    str을 상속하면 응답 문자열 전체가 새 인스턴스로 한 번 더 복사되므로,
+    API가 돌려준 문자열을 그대로 content에 담아 두고 str 동작은 위임합니다.
+    print()나 f-string에서는 content가 그대로 출력되며, upper()/split() 등
+    문자열 메서드와 ==, +, in, 인덱싱/슬라이싱(response[0]), 순회(for ch in response)도
+    content에 대해 동작합니다.
+
+    주의: str의 하위 클래스가 아니므로 isinstance(response, str)는 False이며,
+    str 타입을 기대하는 곳에는 str(response) 또는 response.content를 넘겨야 합니다.
+        - st.write(response): 마크다운이 아니라 객체 형태로 표시됨 -> st.write(str(response))
+        - json.loads(response): TypeError -> json.loads(response.content)
+        - re.search(pattern, response) 등 str을 요구하는 함수: TypeError -> str(response)
+
+    Attributes:
+        content: 응답 내용 문자열
+        usage: 토큰 사용량 정보 (선택사항)
+    """
+
+    content: str
+    usage: Usage | None = None
+
+    def __str__(self) -> str:
+        return self.content
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResponseWithUsage):
+            other = other.content
+        return self.content == other
+
+    def __hash__(self) -> int:
+        return hash(self.content)
+
+    def __add__(self, other: str) -> str:
+        return self.content + other
+
+    def __radd__(self, other: str) -> str:
+        return other + self.content
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.content
+
+    def __getitem__(self, key: int | slice) -> str:
+        return self.content[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.content)
+
+    def __getattr__(self, name: str):
+        # 정의되지 않은 속성(문자열 메서드 등)은 content에 위임
+        # (복사/pickle 시 content가 아직 설정되지 않은 상태에서 호출되는 특수 속성과
+        #  content 자신은 제외 -> 무한 재귀 방지)
+        if name == "content" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.content, name)
+
+
+class StreamingResponseWithUsage:
+    """응답을 조각(토큰) 단위로 순회할 수 있는 스트리밍 응답 클래스.
 
-    일반 문자열처럼 사용할 수 있으며, 추가로 usage 속성을 통해
+    for 문이나 Streamlit의 st.write_stream()으로 순회하면 응답 조각이 도착하는 즉시
+    받을 수 있습니다. 순회가 끝나면 content와 usage 속성으로 전체 응답과
     토큰 사용량 정보에 접근할 수 있습니다.
+
+    Attributes:
+        content: 지금까지 수신한 응답 문자열
+        usage: 토큰 사용량 정보 (스트림의 마지막 조각에서 설정됨)
     """
 
-    def __new__(cls, content: str, usage: Usage | None = None):
-        """ResponseWithUsage 인스턴스 생성.
+    def __init__(self, stream: Iterable[ChatCompletionChunk]):
+        """StreamingResponseWithUsage 인스턴스 생성.
 
         Args:
-            content: 응답 내용 문자열
-            usage: 토큰 사용량 정보 (선택사항)
-
-        주의: __init__ 대신 __new__를 사용하는 이유
-        - str은 불변(immutable) 객체라서 생성 후에는 값을 변경할 수 없음
-        - __new__는 객체 생성 시점에 호출되어 str 값을 설정 가능
-        - __init__은 객체 생성 후 호출되므로 str 값 변경 불가
+            stream: stream=True로 호출한 Chat Completion API의 응답 스트림
         """
-        # 1. str 타입의 인스턴스를 content 값으로 생성
-        instance = super().__new__(cls, content)
-        # 2. 생성된 인스턴스에 usage 정보를 속성으로 추가
-        instance._usage = usage
-        # 3. 완성된 인스턴스 반환
-        return instance
+        self._stream = stream
+        self._chunks: list[str] = []
+        self.usage: Usage | None = None
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._stream:
+            # stream_options={"include_usage": True}인 경우
+            # choices가 빈 마지막 조각에 usage 정보가 담겨 옴
+            if chunk.usage:
+                self.usage = _make_usage(chunk.usage)
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    self._chunks.append(delta)
+                    yield delta
 
     @property
-    def usage(self) -> Usage | None:
-        """토큰 사용량 정보를 반환합니다."""
-        return self._usage
+    def content(self) -> str:
+        """지금까지 수신한 응답 문자열을 반환합니다."""
+        return "".join(self._chunks)
 
 
 # TypeVar for Generic support
@@ -99,6 +177,18 @@ class StructuredResponseWithUsage(Generic[T]):
         self.usage = usage
 
 
+# 앱에서 다루는 파일 확장자별 MIME 타입 (mimetypes 모듈의 시스템 DB 로딩 없이 바로 조회)
+_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".pdf": "application/pdf",
+    ".hwp": "application/x-hwp",
+}
+
+
 def get_mime_type(file_path: str) -> str:
     """파일 경로에서 MIME 타입을 추론합니다.
 
@@ -112,8 +202,146 @@ def get_mime_type(file_path: str) -> str:
         확장자 기반으로 추론하며, 알 수 없는 확장자의 경우
         'application/octet-stream'을 반환합니다.
     """
-    mime_type, _ = mimetypes.guess_type(file_path)
-    return mime_type or "application/octet-stream"
+    return _MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), "application/octet-stream")
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str | None) -> OpenAI:
+    """API 키별로 OpenAI 클라이언트를 하나만 생성하여 재사용합니다.
+
+    클라이언트는 내부에 HTTP 커넥션 풀을 가지고 있으므로, 호출마다 새로 만들지 않고
+    재사용하면 TCP/TLS 연결을 다시 맺는 비용을 줄일 수 있습니다.
+    """
+    return OpenAI(api_key=api_key)
+
+
+def _build_messages(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+) -> list[dict]:
+    """Chat Completion API에 전달할 메시지 리스트를 구성합니다.
+
+    Args:
+        user_content (str): 사용자 메시지.
+        file_path (str | None, optional): 첨부할 파일 경로 (이미지/PDF). 기본값은 None.
+        file (FileUploadProtocol | BinaryIO | None, optional): 첨부할 파일 객체 (이미지/PDF). 기본값은 None.
+        system_content (str | None, optional): 시스템 메시지. 기본값은 None.
+
+    Returns:
+        list[dict]: 메시지 딕셔너리 리스트
+    """
+    # 사용자 메시지 구성
+    user_message_content = user_content  # 기본값: 텍스트만
+
+    if file_path or file:
+        # 파일 정보 추출 (삼항 연산자 활용)
+        filename = os.path.basename(file_path) if file_path else file.name
+        mime_type = get_mime_type(file_path) if file_path else file.type
+
+        # base64 URL 생성
+        base64_url = make_base64_url(file_path=file_path, file=file)
+
+        # 파일 딕셔너리 생성 (삼항 연산자로 단순화)
+        file_dict = (
+            {
+                "type": "image_url",
+                "image_url": {"url": base64_url, "detail": "high"},
+            }
+            if mime_type.startswith("image/")
+            else {
+                "type": "file",
+                "file": {"filename": filename, "file_data": base64_url},
+            }
+        )
+
+        # 텍스트와 파일을 포함한 content 구성
+        user_message_content = [
+            {"type": "text", "text": user_content},
+            file_dict,
+        ]
+
+    # 메시지 리스트를 한 번에 구성 (빈 리스트 생성 후 append 반복 없이)
+    if system_content:
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_message_content},
+        ]
+    return [{"role": "user", "content": user_message_content}]
+
+
+def _max_tokens_kwargs(max_tokens: int | None) -> dict:
+    """max_tokens가 지정된 경우에만 API 호출 인자로 전달합니다 (None이면 모델 기본값 사용)."""
+    return {} if max_tokens is None else {"max_tokens": max_tokens}
+
+
+def _make_usage(usage: CompletionUsage | None) -> Usage | None:
+    """API 응답의 usage 정보를 Usage 객체로 변환합니다."""
+    if not usage:
+        return None
+    return Usage(
+        input_tokens=usage.prompt_tokens,
+        output_tokens=usage.completion_tokens,
+        total_tokens=usage.total_tokens,
+    )
+
+
+# 모델 클래스별 JSON 스키마 캐시 (스키마 생성은 클래스당 한 번만 수행)
+# functools.cache는 클래스를 영구히 붙잡아 두므로, Streamlit처럼 재실행마다 모델 클래스가
+# 새로 정의되는 경우 캐시가 계속 늘어남 -> 클래스가 사라지면 항목도 함께 제거되는 약한 참조 사용
+_SCHEMA_CACHE: "weakref.WeakKeyDictionary[type[BaseModel], dict]" = weakref.WeakKeyDictionary()
+
+
+def _schema_for(cls: type[BaseModel]) -> dict:
+    """Pydantic 모델 클래스의 strict 모드용 JSON 스키마를 반환합니다 (클래스별 캐시)."""
+    schema = _SCHEMA_CACHE.get(cls)
+    if schema is None:
+        schema = _SCHEMA_CACHE[cls] = to_strict_json_schema(cls)
+    return schema
+
+
+def _response_format_param(response_format: type[BaseModel]) -> dict:
+    """Pydantic 모델 클래스를 API의 json_schema response_format 파라미터로 변환합니다.
+
+    strict 모드에서는 서버가 스키마에 맞는 토큰만 생성하므로(constrained decoding)
+    스키마 불일치로 인한 재요청이 필요 없습니다.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_format.__name__,
+            "schema": _schema_for(response_format),
+            "strict": True,
+        },
+    }
+
+
+def _make_structured_response(
+    response: ChatCompletion, response_format: type[T]
+) -> StructuredResponseWithUsage[T]:
+    """JSON 응답을 Pydantic 모델로 검증하여 StructuredResponseWithUsage로 변환합니다.
+
+    모델이 응답을 거부한 경우(refusal) parsed는 None입니다.
+
+    Raises:
+        LengthFinishReasonError: max_tokens에 걸려 응답 JSON이 중간에 잘린 경우
+        ContentFilterFinishReasonError: 콘텐츠 필터로 응답이 차단된 경우
+    """
+    # beta.chat.completions.parse와 동일하게, 잘리거나 차단된 응답은 검증 전에 명확한 오류로 처리
+    choice = response.choices[0]
+    if choice.finish_reason == "length":
+        raise LengthFinishReasonError(completion=response)
+    if choice.finish_reason == "content_filter":
+        raise ContentFilterFinishReasonError(completion=response)
+
+    message = choice.message
+    parsed = (
+        None
+        if message.refusal or not message.content
+        else response_format.model_validate_json(message.content)
+    )
+    return StructuredResponseWithUsage(parsed=parsed, usage=_make_usage(response.usage))
 
 
 # Overload for when response_format is provided (returns StructuredResponseWithUsage)
@@ -130,6 +358,8 @@ def make_response(
     model: str | ChatModel = "gpt-4o-mini",
     temperature: float = 0.25,
     api_key: str | None = None,
+    stream: Literal[False] = False,
+    max_tokens: int | None = None,
 ) -> StructuredResponseWithUsage[T]: ...
 
 
@@ -147,9 +377,30 @@ def make_response(
     api_key: str | None = None,
     *,
     response_format: None = None,
+    stream: Literal[False] = False,
+    max_tokens: int | None = None,
 ) -> ResponseWithUsage: ...
 
 
+# Overload for when stream=True (returns StreamingResponseWithUsage)
+@overload
+def make_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    *,
+    response_format: None = None,
+    stream: Literal[True],
+    max_tokens: int | None = None,
+) -> StreamingResponseWithUsage: ...
+
+
 def make_response(
     user_content: str,
     file_path: str | None = None,  # 새로운 범용 파일 경로 (이미지/PDF)
@@ -163,7 +414,9 @@ def make_response(
     temperature: float = 0.25,
     api_key: str | None = None,
     response_format: type[BaseModel] | None = None,  # 새로운 파라미터
-) -> ResponseWithUsage | StructuredResponseWithUsage:
+    stream: bool = False,
+    max_tokens: int | None = None,
+) -> ResponseWithUsage | StructuredResponseWithUsage | StreamingResponseWithUsage:
     """OpenAI의 Chat Completion API를 사용하여 AI의 응답을 생성합니다.
 
     이미지 파일(.png, .jpg, .jpeg)과 PDF 파일을 지원하며,
@@ -180,11 +433,20 @@ def make_response(
         temperature (float, optional): 생성 결과의 창의성. 기본값은 0.25.
         api_key (str | None, optional): OpenAI API 키. 기본값은 None.
         response_format (type[BaseModel] | None, optional): Pydantic 모델 클래스. 기본값은 None.
+        stream (bool, optional): 응답을 조각 단위로 스트리밍할지 여부. 기본값은 False.
+            response_format과 함께 사용할 수 없습니다.
+        max_tokens (int | None, optional): 생성할 최대 토큰 수. None이면 제한 없음. 기본값은 None.
 
     Returns:
-        ResponseWithUsage | StructuredResponseWithUsage:
-            - response_format이 None인 경우: ResponseWithUsage (문자열처럼 사용 가능)
+        ResponseWithUsage | StructuredResponseWithUsage | StreamingResponseWithUsage:
+            - response_format이 None인 경우: ResponseWithUsage (str()로 문자열 변환, content로 원문 접근)
             - response_format이 제공된 경우: StructuredResponseWithUsage (파싱된 Pydantic 모델 포함)
+            - stream이 True인 경우: StreamingResponseWithUsage (순회하며 응답 조각 수신)
+
+    Raises:
+        ValueError: stream과 response_format을 함께 지정한 경우
+        LengthFinishReasonError: response_format 사용 시 max_tokens에 걸려 응답이 잘린 경우
+        ContentFilterFinishReasonError: response_format 사용 시 콘텐츠 필터로 응답이 차단된 경우
 
     Examples:
         일반 텍스트 응답:
@@ -202,96 +464,66 @@ def make_response(
         ... )
         >>> print(response.parsed.name)  # "철수"
         >>> print(response.parsed.age)  # 25
-    """
-    # 1. 호환성 처리 (간단하게)
-    file_path = file_path or image_path
-    file = file or image_file
-
-    # 2. 메시지 리스트 초기화
-    messages = []
-    if system_content:
-        messages.append({"role": "system", "content": system_content})
 
-    # 3. 사용자 메시지 구성
-    user_message_content = user_content  # 기본값: 텍스트만
-
-    if file_path or file:
-        # 파일 정보 추출 (삼항 연산자 활용)
-        filename = os.path.basename(file_path) if file_path else file.name
-        mime_type = get_mime_type(file_path) if file_path else file.type
-
-        # base64 URL 생성
-        base64_url = make_base64_url(file_path=file_path, file=file)
-
-        # 파일 딕셔너리 생성 (삼항 연산자로 단순화)
-        file_dict = (
-            {
-                "type": "image_url",
-                "image_url": {"url": base64_url, "detail": "high"},
-            }
-            if mime_type.startswith("image/")
-            else {
-                "type": "file",
-                "file": {"filename": filename, "file_data": base64_url},
-            }
-        )
-
-        # 텍스트와 파일을 포함한 content 구성
-        user_message_content = [
-            {"type": "text", "text": user_content},
-            file_dict,
-        ]
+        스트리밍 응답:
+        >>> response = make_response("안녕하세요", stream=True)
+        >>> for text in response:
+        ...     print(text, end="")
+        >>> print(response.usage.output_tokens)  # 12
+    """
+    if stream and response_format is not None:
+        raise ValueError("stream과 response_format은 함께 사용할 수 없습니다.")
 
-    messages.append({"role": "user", "content": user_message_content})
+    # 1~3. 메시지 구성
+    messages = _build_messages(
+        user_content,
+        file_path=file_path or image_path,  # 호환성 처리
+        file=file or image_file,
+        system_content=system_content,
+    )
 
     # 4. API 호출
-    client = OpenAI(api_key=api_key)
+    client = _get_client(api_key)
 
     # Pydantic 모델이 제공된 경우 - Structured Output 사용
     if response_format is not None:
-        # beta.chat.completions.parse를 사용하여 구조화된 출력 생성
-        response = client.beta.chat.completions.parse(
+        # beta.chat.completions.parse 헬퍼 대신 json_schema를 직접 전달하고,
+        # 응답 JSON은 pydantic-core(Rust)의 model_validate_json으로 바로 검증
+        response = client.chat.completions.create(
             model=model,
             messages=messages,
-            response_format=response_format,
+            response_format=_response_format_param(response_format),
             temperature=temperature,
-        )
-
-        # Usage 정보 추출
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage
-            else None
+            **_max_tokens_kwargs(max_tokens),
         )
 
         # 파싱된 객체와 usage 정보를 함께 반환
-        return StructuredResponseWithUsage(
-            parsed=response.choices[0].message.parsed,
-            usage=usage,
+        return _make_structured_response(response, response_format)
+
+    # 스트리밍 응답 - 첫 토큰부터 바로 받을 수 있음
+    elif stream:
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **_max_tokens_kwargs(max_tokens),
+            stream=True,
+            stream_options={"include_usage": True},
         )
 
+        return StreamingResponseWithUsage(response)
+
     # 기존 방식 - 일반 텍스트 응답
     else:
         response = client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=temperature,
+            **_max_tokens_kwargs(max_tokens),
         )
 
         # 5. Usage 정보 추출 및 반환
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage
-            else None
-        )
+        usage = _make_usage(response.usage)
 
         return ResponseWithUsage(
             content=response.choices[0].message.content or "",
@@ -299,6 +531,120 @@ def make_response(
         )
 
 
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    response_format: type[BaseModel] | None = None,
+    max_tokens: int | None = None,
+    client: AsyncOpenAI | None = None,
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """make_response의 비동기(async) 버전입니다.
+
+    여러 요청을 asyncio.gather로 동시에 보낼 때 사용합니다.
+    인자와 반환값은 make_response와 같습니다 (스트리밍은 지원하지 않음).
+
+    Args:
+        client (AsyncOpenAI | None, optional): 재사용할 비동기 클라이언트.
+            None인 경우 이번 호출에서만 사용할 클라이언트를 생성합니다. 기본값은 None.
+
+    Returns:
+        ResponseWithUsage | StructuredResponseWithUsage: make_response와 동일
+    """
+    messages = _build_messages(
+        user_content,
+        file_path=file_path or image_path,
+        file=file or image_file,
+        system_content=system_content,
+    )
+
+    # 비동기 클라이언트는 이벤트 루프에 묶이므로 전역으로 캐시하지 않음
+    if client is None:
+        async with AsyncOpenAI(api_key=api_key) as client:
+            return await _acomplete(client, messages, model, temperature, response_format, max_tokens)
+    return await _acomplete(client, messages, model, temperature, response_format, max_tokens)
+
+
+async def _acomplete(
+    client: AsyncOpenAI,
+    messages: list[dict],
+    model: str | ChatModel,
+    temperature: float,
+    response_format: type[BaseModel] | None,
+    max_tokens: int | None,
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """비동기 클라이언트로 API를 호출하고 응답 객체로 변환합니다."""
+    if response_format is not None:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            response_format=_response_format_param(response_format),
+            temperature=temperature,
+            **_max_tokens_kwargs(max_tokens),
+        )
+        return _make_structured_response(response, response_format)
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        **_max_tokens_kwargs(max_tokens),
+    )
+    return ResponseWithUsage(
+        content=response.choices[0].message.content or "",
+        usage=_make_usage(response.usage),
+    )
+
+
+def make_responses_batch(
+    user_contents: list[str],
+    api_key: str | None = None,
+    max_tokens: int | list[int | None] | None = None,
+    **kwargs,
+) -> list[ResponseWithUsage | StructuredResponseWithUsage]:
+    """여러 사용자 메시지에 대한 응답을 동시에 생성합니다.
+
+    서로 독립적인 요청들을 asyncio.gather로 한 번에 보내므로, 전체 소요 시간이
+    각 요청 시간의 합이 아니라 가장 오래 걸린 요청 시간에 가까워집니다.
+
+    Args:
+        user_contents (list[str]): 사용자 메시지 리스트.
+        api_key (str | None, optional): OpenAI API 키. 기본값은 None.
+        max_tokens (int | list[int | None] | None, optional): 생성할 최대 토큰 수.
+            리스트를 넘기면 user_contents와 같은 순서로 요청마다 따로 적용합니다. 기본값은 None.
+        **kwargs: amake_response에 그대로 전달할 인자 (system_content, response_format 등).
+
+    Returns:
+        list[ResponseWithUsage | StructuredResponseWithUsage]: user_contents와 같은 순서의 응답 리스트
+
+    Examples:
+        >>> responses = make_responses_batch(["사과", "바나나"], system_content="색깔을 알려줘")
+        >>> print(responses[0])  # "빨간색입니다."
+    """
+
+    if not isinstance(max_tokens, list):
+        max_tokens = [max_tokens] * len(user_contents)
+    if len(max_tokens) != len(user_contents):
+        raise ValueError("max_tokens 리스트의 길이는 user_contents와 같아야 합니다.")
+
+    async def run():
+        async with AsyncOpenAI(api_key=api_key) as client:
+            return await asyncio.gather(
+                *(
+                    amake_response(content, client=client, max_tokens=content_max_tokens, **kwargs)
+                    for content, content_max_tokens in zip(user_contents, max_tokens)
+                )
+            )
+
+    return asyncio.run(run())
+
+
 def download_file(
     file_url: str,
     filepath: str | None = None,  # default parameter
@@ -316,21 +662,24 @@ def download_file(
     Note:
         동일한 경로에 파일이 이미 존재할 경우 덮어씁니다.
     """
-    res = requests.get(file_url)
-    print("res ok :", res.ok)
+    import requests
 
     if filepath is None:
         filepath = os.path.basename(file_url)
 
-    file_content = res.content
+    # stream=True로 응답 전체를 메모리에 올리지 않고, 받는 즉시 1MB 단위로 디스크에 기록
+    with requests.get(file_url, stream=True) as res:
+        print("res ok :", res.ok)
+        res.raise_for_status()
+        res.raw.decode_content = True  # gzip 등 전송 인코딩을 풀어서 저장
 
-    dir_path = os.path.dirname(filepath)
-    os.makedirs(dir_path, exist_ok=True)
+        dir_path = os.path.dirname(filepath)
+        os.makedirs(dir_path, exist_ok=True)
 
-    # 주의 : 같은 경로의 경로일 경우, 덮어쓰기가 됩니다.
-    with open(filepath, "wb") as f:
-        f.write(file_content)
-        print("saved", filepath)
+        # 주의 : 같은 경로의 경로일 경우, 덮어쓰기가 됩니다.
+        with open(filepath, "wb") as f:
+            shutil.copyfileobj(res.raw, f, length=1024 * 1024)
+            print("saved", filepath)
 
 
 def multiply(a: int, b: int) -> int:
@@ -375,127 +724,39 @@ def make_base64_url(
         # 파일 경로에서 MIME 타입 추론
         mime_type = get_mime_type(file_path)
         with open(file_path, "rb") as f:
-            data: bytes = f.read()
+            return _encode_base64_url(f, mime_type)
     elif file:
         # 파일 객체에서 MIME 타입 가져오기
         mime_type = file.type if hasattr(file, "type") else "application/octet-stream"
-        data = file.read()
+        return _encode_base64_url(file, mime_type)
     else:
         raise ValueError("file_path 혹은 file 인자를 지정해주세요.")
 
-    b64_str: str = b64encode(data).decode()
-    url = f"data:{mime_type};base64," + b64_str
-    return url
 
+# base64 인코딩 시 한 번에 읽을 크기 (3의 배수여야 중간에 패딩이 생기지 않음)
+_B64_CHUNK_SIZE = 3 * 64 * 1024
 
-def hwp_to_html(
-    hwp_path: str | None = None, hwp_file: FileUploadProtocol | BinaryIO | None = None
-) -> str:
-    """
-    HWP 파일을 HTML 문자열로 변환합니다.
 
-    Args:
-        hwp_path: HWP 파일의 경로
-        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
-
-    Returns:
-        정제된 HTML 문자열
+def _encode_base64_url(f: FileUploadProtocol | BinaryIO, mime_type: str) -> str:
+    """파일 객체를 조각 단위로 읽어 base64 data URL로 변환합니다.
 
-    Raises:
-        ValueError: 입력이 잘못된 경우
-        RuntimeError: HWP 변환 실패
+    파일 전체를 bytes로 읽은 뒤 인코딩하지 않고, 조각별 인코딩 결과를 하나의
+    bytearray에 이어 붙여 중간 복사본(원본 전체, 인코딩 결과 전체)을 만들지 않습니다.
     """
-    # 입력 검증
-    if not hwp_path and not hwp_file:
-        raise ValueError("hwp_path 또는 hwp_file 중 하나는 필수입니다.")
-    if hwp_path and hwp_file:
-        raise ValueError("hwp_path와 hwp_file을 동시에 제공할 수 없습니다.")
-
-    temp_hwp_path = None
-    temp_output_dir = None
-
-    try:
-        # hwp_file이 제공된 경우 임시 파일로 저장
-        if hwp_file:
-            # 파일 내용 읽기
-            if hasattr(hwp_file, "read"):
-                content = hwp_file.read()
-                # bytes가 아닌 경우 처리
-                if isinstance(content, str):
-                    content = content.encode("utf-8")
-            else:
-                raise ValueError("hwp_file은 read() 메서드를 가져야 합니다.")
-
-            # 임시 HWP 파일 생성
-            with tempfile.NamedTemporaryFile(suffix=".hwp", delete=False) as temp_hwp:
-                temp_hwp.write(content)
-                temp_hwp_path = temp_hwp.name
-                working_hwp_path = temp_hwp_path
-        else:
-            working_hwp_path = hwp_path
+    out = bytearray(f"data:{mime_type};base64,".encode("ascii"))
+    while chunk := f.read(_B64_CHUNK_SIZE):
+        out += b64encode(chunk)
+    return out.decode("ascii")
 
-        # xmlmodel.Hwp5File을 사용하여 HWP 파일 열기 (hwp5html과 동일한 방식)
-        with closing(Hwp5File(working_hwp_path)) as hwp5file:
-            # HTMLTransform 인스턴스 생성
-            transform = HTMLTransform()
 
-            # 임시 출력 디렉토리 생성
-            temp_output_dir = tempfile.mkdtemp()
+# hwp_to_html의 임시 파일 위치 (리눅스에서는 디스크 대신 메모리 기반 tmpfs 사용)
+_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
 
-            # HWP를 HTML로 변환 (디렉토리에 출력)
-            transform.transform_hwp5_to_dir(hwp5file, temp_output_dir)
+# hwp_to_html에서 제거할 속성 목록
+_HTML_STRIP_ATTRS = ("style", "width", "height", "align", "valign", "bgcolor", "border")
 
-            # 생성된 index.xhtml 파일 읽기
-            html_path = os.path.join(temp_output_dir, "index.xhtml")
-
-            if not os.path.exists(html_path):
-                raise RuntimeError("HTML 변환 결과를 찾을 수 없습니다.")
-
-            with open(html_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-
-        # BeautifulSoup으로 HTML 파싱 및 정제
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # 불필요한 태그 제거
-        for tag in soup.find_all(["script", "style", "link", "img", "meta"]):
-            tag.decompose()
-
-        # 모든 인라인 style 속성 제거
-        for tag in soup.find_all(True):  # 모든 태그 선택
-            if tag.has_attr("style"):
-                del tag["style"]
-            # 다른 불필요한 속성들도 제거 (class는 유지)
-            for attr in ["width", "height", "align", "valign", "bgcolor", "border"]:
-                if tag.has_attr(attr):
-                    del tag[attr]
-
-        # head 태그 찾기 또는 생성
-        head = soup.find("head")
-        if not head:
-            head = soup.new_tag("head")
-            if soup.html:
-                soup.html.insert(0, head)
-            else:
-                # html 태그도 없으면 생성
-                html = soup.new_tag("html")
-                body = soup.find("body")
-                if body:
-                    body.extract()
-                    html.append(head)
-                    html.append(body)
-                else:
-                    # body도 없으면 전체 콘텐츠를 body로 감싸기
-                    body = soup.new_tag("body")
-                    for child in list(soup.children):
-                        body.append(child.extract())
-                    html.append(head)
-                    html.append(body)
-                soup.append(html)
-
-        # 최소한의 CSS 스타일 추가
-        style_tag = soup.new_tag("style")
-        style_tag.string = """
+# hwp_to_html 결과에 추가할 최소한의 CSS 스타일
+_HTML_STYLE = """
             body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                 line-height: 1.6;
@@ -524,33 +785,246 @@ def hwp_to_html(
                 margin: 10px 0;
             }
         """
-        head.append(style_tag)
 
-        # HTML 문자열로 변환 (XML 선언 제거)
-        html_str = str(soup)
 
-        # XML 선언 제거 (있을 경우)
-        if html_str.startswith("<?xml"):
-            xml_end = html_str.find("?>")
-            if xml_end != -1:
-                html_str = html_str[xml_end + 2 :].strip()
+def _hwp_to_xhtml(
+    hwp_path: str | None = None, hwp_file: FileUploadProtocol | BinaryIO | None = None
+) -> str:
+    """
+    HWP 파일을 pyhwp(hwp5html)로 변환한 XHTML 원문을 반환합니다.
 
-        return html_str
+    Args:
+        hwp_path: HWP 파일의 경로
+        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
+
+    Returns:
+        변환된 XHTML 문자열 (정제 전)
+
+    Raises:
+        ValueError: 입력이 잘못된 경우
+        RuntimeError: HWP 변환 실패
+    """
+    # hwp5는 import 비용이 커서, HWP 변환이 필요한 페이지에서만 불러옴
+    from hwp5.hwp5html import HTMLTransform
+    from hwp5.xmlmodel import Hwp5File
+
+    # 입력 검증
+    if not hwp_path and not hwp_file:
+        raise ValueError("hwp_path 또는 hwp_file 중 하나는 필수입니다.")
+    if hwp_path and hwp_file:
+        raise ValueError("hwp_path와 hwp_file을 동시에 제공할 수 없습니다.")
+
+    try:
+        # 입력 HWP와 변환 결과를 하나의 임시 디렉토리(가능하면 tmpfs)에 두고,
+        # with 블록을 벗어나면 디렉토리째 정리
+        with tempfile.TemporaryDirectory(dir=_TEMP_DIR) as temp_dir:
+            # hwp_file이 제공된 경우 임시 파일로 저장
+            if hwp_file:
+                # 파일 내용 읽기
+                if hasattr(hwp_file, "read"):
+                    content = hwp_file.read()
+                    # bytes가 아닌 경우 처리
+                    if isinstance(content, str):
+                        content = content.encode("utf-8")
+                else:
+                    raise ValueError("hwp_file은 read() 메서드를 가져야 합니다.")
+
+                # 임시 HWP 파일 생성
+                working_hwp_path = os.path.join(temp_dir, "input.hwp")
+                Path(working_hwp_path).write_bytes(content)
+            else:
+                working_hwp_path = hwp_path
+
+            # xmlmodel.Hwp5File을 사용하여 HWP 파일 열기 (hwp5html과 동일한 방식)
+            with closing(Hwp5File(working_hwp_path)) as hwp5file:
+                # HTMLTransform 인스턴스 생성
+                transform = HTMLTransform()
+
+                # HWP를 HTML로 변환 (임시 디렉토리에 출력)
+                transform.transform_hwp5_to_dir(hwp5file, temp_dir)
+
+            # 생성된 index.xhtml 파일 읽기
+            html_path = Path(temp_dir, "index.xhtml")
+
+            if not html_path.exists():
+                raise RuntimeError("HTML 변환 결과를 찾을 수 없습니다.")
+
+            return html_path.read_bytes().decode("utf-8")
 
     except Exception as e:
         raise Exception(f"HWP 변환 중 오류 발생: {e}")
-    finally:
-        # 임시 파일 및 디렉토리 정리
-        if temp_hwp_path and os.path.exists(temp_hwp_path):
-            try:
-                os.unlink(temp_hwp_path)
-            except:
-                pass
-        if temp_output_dir and os.path.exists(temp_output_dir):
-            try:
-                # 디렉토리 내 모든 파일 삭제
-                import shutil
-
-                shutil.rmtree(temp_output_dir)
-            except:
-                pass
\ No newline at end of file
+
+
+def hwp_to_html(
+    hwp_path: str | None = None, hwp_file: FileUploadProtocol | BinaryIO | None = None
+) -> str:
+    """
+    HWP 파일을 HTML 문자열로 변환합니다.
+
+    Args:
+        hwp_path: HWP 파일의 경로
+        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
+
+    Returns:
+        정제된 HTML 문자열
+
+    Raises:
+        ValueError: 입력이 잘못된 경우
+        RuntimeError: HWP 변환 실패
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    # selectolax(C 기반 lexbor 파서)로 HTML 파싱 및 정제
+    tree = LexborHTMLParser(_hwp_to_xhtml(hwp_path, hwp_file))
+
+    # 불필요한 태그 제거
+    tree.strip_tags(["script", "style", "link", "img", "meta"])
+
+    # 모든 인라인 style 속성 및 불필요한 속성 제거 (class는 유지)
+    for node in tree.css("*"):
+        attributes = node.attributes
+        for attr in _HTML_STRIP_ATTRS:
+            if attr in attributes:
+                del node.attrs[attr]
+
+    # 남은 head 내용(title 등)에 최소한의 CSS 스타일을 더해 문서 구성
+    # (파서가 html/head/body를 항상 만들어 주므로 head 생성 처리는 불필요하며,
+    #  XML 선언도 출력에 포함되지 않음)
+    head_html = "".join(child.html for child in tree.head.iter()) if tree.head else ""
+    body_html = tree.body.html if tree.body else ""
+    return f"<html><head>{head_html}<style>{_HTML_STYLE}</style></head>{body_html}</html>"
+
+
+def hwp_to_markdown(
+    hwp_path: str | None = None, hwp_file: FileUploadProtocol | BinaryIO | None = None
+) -> str:
+    """
+    HWP 파일을 LLM 입력용 Markdown 문자열로 변환합니다.
+
+    표는 `| 칸 | 칸 |` 형식의 Markdown 표로, 나머지는 줄 단위 텍스트로 출력하며
+    각 표와 문단은 빈 줄로 구분됩니다. 태그와 속성이 빠지므로 같은 문서를
+    HTML로 보낼 때보다 입력 토큰 수가 크게 줄어듭니다.
+
+    Args:
+        hwp_path: HWP 파일의 경로
+        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
+
+    Returns:
+        Markdown 문자열
+
+    Raises:
+        ValueError: 입력이 잘못된 경우
+        RuntimeError: HWP 변환 실패
+    """
+    return xhtml_to_markdown(_hwp_to_xhtml(hwp_path, hwp_file))
+
+
+def xhtml_to_markdown(xhtml: str) -> str:
+    """
+    hwp5html이 만든 (X)HTML 문자열을 hwp_to_markdown과 같은 형식의 Markdown으로 변환합니다.
+
+    Args:
+        xhtml: 변환할 (X)HTML 문자열 (예: hwp5html로 미리 변환해 둔 .html 파일 내용)
+
+    Returns:
+        Markdown 문자열
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(xhtml)
+    tree.strip_tags(["script", "style"])
+
+    blocks: list[str] = []
+    if tree.body:
+        _collect_markdown_blocks(tree.body, blocks)
+    return "\n\n".join(blocks)
+
+
+def _collect_markdown_blocks(node, blocks: list[str]) -> None:
+    """노드를 순회하며 표는 Markdown 표로, 나머지는 텍스트 블록으로 blocks에 추가합니다."""
+    if node.tag == "table":
+        table_md = _table_to_markdown(node)
+        if table_md:
+            blocks.append(table_md)
+        return
+
+    # 하위에 표가 없으면 텍스트만 한 번에 추출
+    if node.tag == "-text" or node.css_first("table") is None:
+        text = node.text(separator=" ", strip=True)
+        if text:
+            blocks.append(text)
+        return
+
+    for child in node.iter(include_text=True):
+        _collect_markdown_blocks(child, blocks)
+
+
+def _table_to_markdown(table) -> str:
+    """table 노드를 Markdown 표 문자열로 변환합니다 (중첩 표는 셀 텍스트로 펼침).
+
+    병합된 열(colspan)은 빈 칸으로 채우고, 병합된 행(rowspan)은 아래 행들의 같은 열에
+    같은 값을 반복해 넣어, 각 행만 보고도 직위/성명 등과 업무를 연결할 수 있게 합니다.
+    """
+    rows: list[list[str]] = []
+    # 열 번호 -> [남은 행 수, 채울 값] (위쪽 행의 rowspan이 아직 덮고 있는 열)
+    pending: dict[int, list] = {}
+    # 중첩 표의 행이 섞이지 않도록 직계 행(thead/tbody/tfoot 포함)만 사용
+    for section in table.iter():
+        for tr in section.iter() if section.tag in ("thead", "tbody", "tfoot") else (section,):
+            if tr.tag != "tr":
+                continue
+            row: list[str] = []
+            for cell in tr.iter():
+                if cell.tag not in ("td", "th"):
+                    continue
+                _fill_pending_cells(row, pending)
+                text = cell.text(separator=" ", strip=True).replace("|", "\\|")
+                colspan = _span(cell, "colspan")
+                rowspan = _span(cell, "rowspan")
+                # 병합된 열은 빈 칸으로 채워 열 위치를 맞춤
+                for value in [text] + [""] * (colspan - 1):
+                    if rowspan > 1:
+                        pending[len(row)] = [rowspan - 1, value]
+                    row.append(value)
+            # 셀이 끝난 뒤(오른쪽 끝)에도 위에서 내려오는 열이 남아 있으면 채움
+            _fill_pending_cells(row, pending, to_end=True)
+            if any(row):
+                rows.append(row)
+
+    if not rows:
+        return ""
+
+    width = max(len(row) for row in rows)
+    lines = ["| " + " | ".join(row + [""] * (width - len(row))) + " |" for row in rows]
+    # 첫 행을 헤더로 사용
+    lines.insert(1, "|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+def _span(cell, name: str) -> int:
+    """셀의 colspan/rowspan 값을 정수로 반환합니다 (없거나 잘못된 값이면 1)."""
+    value = cell.attributes.get(name) or "1"
+    return max(int(value), 1) if value.isdigit() else 1
+
+
+def _fill_pending_cells(row: list[str], pending: dict[int, list], to_end: bool = False) -> None:
+    """위쪽 행의 rowspan이 덮고 있는 열을 row의 현재 위치부터 채웁니다.
+
+    to_end가 False이면 다음 셀이 들어갈 빈 열이 나올 때까지만, True이면 남은 열을 모두 채웁니다.
+    """
+    while pending:
+        col = len(row)
+        if col not in pending:
+            if not to_end:
+                return
+            # 중간에 빈 열이 있으면 빈 칸으로 건너뜀
+            if col > max(pending):
+                return
+            row.append("")
+            continue
+        remaining, value = pending[col]
+        row.append(value)
+        if remaining <= 1:
+            del pending[col]
+        else:
+            pending[col][0] = remaining - 1